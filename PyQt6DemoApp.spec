@@ -6,12 +6,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('src/modules', 'modules')],  # モジュールを含める
-    hiddenimports=[
+    hiddenimports=[  # MainWindow が importlib で読み込むアプリを含める
         'modules.main_window', 
         'modules.notepad', 
         'modules.image_viewer', 
         'modules.pdf_viewer', 
         'modules.ai_chat',
+        'modules.document_creator',
         'pydantic.deprecated.decorator',
         'pydantic.deprecated',
         'pydantic.json',
@@ -2,30 +2,78 @@
 main.py
 """
 
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication
+import asyncio
+import logging
+import logging.handlers
+import queue
 import sys
+import qasync
 from modules.main_window import MainWindow
 
+# Application-wide stylesheet, parsed once instead of per widget
+STYLESHEET = """
+QPushButton#SendButton {
+    background-color: #128C7E;
+    border-radius: 25px;
+}
+"""
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure logging so that records are written to stderr by a background
+    thread, and logging from the event loop never blocks on the console.
+
+    Returns:
+        The started listener, to be stopped on exit
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    # Only the message is rendered here; the stream handler adds the prefix
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.WARNING, handlers=[queue_handler])
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
 
 def main():
     """
     Main function to run the PyQt6 application.
     This function initializes the QApplication, creates the main window,
-    and starts the event loop.
+    and starts the asyncio-aware Qt event loop.
     Attributes:
         None
     """
+    listener = setup_logging()
     try:
+        # QtWebEngine is imported after the application is created, when the
+        # first PDF is opened, which requires shared OpenGL contexts
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
         app = QApplication(sys.argv)
+        app.setStyleSheet(STYLESHEET)
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
         main_window = MainWindow()
         main_window.show()
-        sys.exit(app.exec())
+        with loop:
+            exit_code = loop.run_forever()
+        sys.exit(exit_code)
     except Exception as e:
         import traceback
 
         with open("error_log.txt", "w") as f:
             f.write(f"Error: {e}\n")
             f.write(traceback.format_exc())
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -2,9 +2,24 @@
 Modules package initialization
 """
 
-from .main_window import MainWindow
-from .notepad import Notepad
-from .image_viewer import ImageViewer
-from .pdf_viewer import PDFViewer
+import importlib
 
-__all__ = ["MainWindow", "Notepad", "ImageViewer", "PDFViewer"]
+# Public names by submodule. Submodules are imported on first access so that
+# importing one module does not load every application and its dependencies.
+_EXPORTS = {
+    "MainWindow": "main_window",
+    "Notepad": "notepad",
+    "ImageViewer": "image_viewer",
+    "PDFViewer": "pdf_viewer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -4,20 +4,67 @@ Provides AI functionality powered by LangGraph and OpenAI.
 Handles conversation flow and model interaction.
 """
 
-import os
-import re
-from typing import List, Dict, Any, Optional, Tuple, Union
-
-# LangGraph imports
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph, MessagesState, END
+import asyncio
+import hashlib
+import logging
+import uuid
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Dict,
+    Any,
+    AsyncIterator,
+    Callable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# LangChain, LangGraph and numpy are imported where they are first used, so
+# importing this module (and starting the app) does not pay for loading them
+if TYPE_CHECKING:
+    import numpy as np
 
 # Pydantic imports
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 # Import app config
-from modules.config import config
+from modules.config import config, config_signals, get_chat_model
+
+logger = logging.getLogger(__name__)
+
+# OpenAI chat roles for LangChain message types
+_OPENAI_ROLES = {"human": "user", "ai": "assistant", "system": "system"}
+
+# Instruction for collapsing older chat turns into a summary
+SUMMARY_PROMPT = (
+    "これまでの会話を、今後の応答に必要な情報を残して簡潔に要約してください。"
+)
+
+# Written to the chat graph's custom stream once the response is complete
+_RESPONSE_COMPLETE = object()
+
+# Separator between the explanation and the edited text in edit-mode responses
+_EDIT_SEPARATOR = "===編集後のテキスト==="
+
+# System prompts for document processing. Kept constant across requests so
+# the prompt prefix can be served from OpenAI's prompt cache.
+SYSTEM_EDIT = """あなたは書類作成アシスタントです。ユーザーの指示に従って提供されたテキストを編集してください。
+
+回答形式:
+1. 最初に編集内容の説明を記載してください。
+2. その後に明確な区切り「===編集後のテキスト===」を入れてください。
+3. その後に編集後のテキスト全体を記載してください。
+
+例:
+「文章を簡潔にしました。また、誤字を修正し、段落を整理しました。」
+
+===編集後のテキスト===
+（編集後のテキスト全体）
+"""
+
+SYSTEM_QA = "あなたは書類作成アシスタントです。ユーザーが提供したテキストについての質問に答えてください。"
 
 
 class DocumentResponse(BaseModel):
@@ -35,22 +82,64 @@ class AIAgent:
     Handles conversation flow and model interaction.
     """
 
+    # Older turns are summarized once the history exceeds either limit
+    MAX_TURNS = 20
+    SUMMARY_TRIGGER_TOKENS = 6000
+
+    # Number of most recent turns always kept verbatim
+    KEEP_RECENT_TURNS = 4
+
+    # Inexpensive model used to summarize older turns
+    SUMMARY_MODEL_NAME = "gpt-4o-mini"
+
+    # Tokens the chat format adds around each message
+    MESSAGE_OVERHEAD_TOKENS = 4
+
+    # Largest user input, in tokens, sent to the model in one request
+    MAX_INPUT_TOKENS = 100_000
+
     def __init__(self):
         """
         Initialize the AI Agent.
         """
-        # Create message queue for chat history
-        self.messages = []
+        # Chat history is kept in the LangGraph checkpointer under this thread.
+        # The checkpointer outlives graph rebuilds so settings changes keep it.
+        self._checkpointer = None
+        self._thread_id = str(uuid.uuid4())
+
+        # OpenAI request payload for the chat history, built incrementally
+        self._serialized_cache: List[Dict[str, str]] = []
+
+        # Token counts of chat history messages by message ID, so each message
+        # is tokenized once rather than on every turn
+        self._token_counts: Dict[str, int] = {}
+
         self.model = None
+        self.summary_model = None
         self.agent = None
 
         # Store current configuration values for change detection
         self._current_api_key = None
         self._current_model_name = None
 
-        # Initialize with current settings
+        # Settings are only re-read after the settings dialog reports a change
+        self._dirty = True
+        config_signals.config_changed.connect(self._mark_dirty)
+
+        # The model and graph are built on first use (see ensure_ready) to
+        # keep construction off the startup path
+
+    def ensure_ready(self):
+        """
+        Build the model and conversation graph if not built yet.
+        Called ahead of time so the first message does not pay the setup cost.
+        """
         self._update_configuration()
 
+    def _mark_dirty(self):
+        """Mark the configuration as needing to be checked again"""
+        self._dirty = True
+
     def _update_configuration(self) -> bool:
         """
         Check and update configuration if settings have changed.
@@ -58,6 +147,10 @@ class AIAgent:
         Returns:
             bool: True if configuration was updated, False otherwise
         """
+        if not self._dirty:
+            return False
+        self._dirty = False
+
         # Get current settings from config
         api_key = config.OPEN_AI_API_KEY
         model_name = config.AI_MODEL_NAME
@@ -70,40 +163,62 @@ class AIAgent:
         self._current_api_key = api_key
         self._current_model_name = model_name
 
-        # Reset model
+        # Reset model; token counts depend on the model's tokenizer
         self.model = None
+        self.summary_model = None
         self.agent = None
+        self._token_counts.clear()
 
         if not api_key:
-            print(
-                "Warning: OPEN_AI_API_KEY is not set in config. AI chat functionality will be limited."
+            logger.warning(
+                "OPEN_AI_API_KEY is not set in config. AI chat functionality will be limited."
             )
             return True
 
         try:
-            # Initialize the model using config values
-            self.model = ChatOpenAI(
-                api_key=api_key,
-                model=model_name,
-                temperature=0.7,
-            )
+            # Initialize the models using config values; clients are shared
+            # between agents with the same settings
+            self.model = get_chat_model(api_key, model_name, 0.7)
+            self.summary_model = get_chat_model(api_key, self.SUMMARY_MODEL_NAME, 0)
 
             # Setup LangGraph for conversation management
             self._setup_langgraph()
             return True
-        except Exception as e:
-            print(f"Error setting up AI agent: {e}")
+        except Exception:
+            logger.exception("Error setting up AI agent")
             self.model = None
+            self.summary_model = None
             return True
 
+    def _serialize_new_messages(self, messages: List[Any]):
+        """
+        Append serialized forms of messages not yet in the payload cache.
+
+        Args:
+            messages: The full chat history from the graph state
+        """
+        for message in messages[len(self._serialized_cache) :]:
+            self._serialized_cache.append(
+                {"role": _OPENAI_ROLES[message.type], "content": message.content}
+            )
+
     def _setup_langgraph(self):
         """Set up LangGraph for conversation flow"""
+        from langchain_core.messages import AIMessage, SystemMessage, RemoveMessage
+        from langgraph.checkpoint.memory import MemorySaver
+        from langgraph.graph import StateGraph, MessagesState, END
+        from langgraph.types import StreamWriter
+
+        if self._checkpointer is None:
+            self._checkpointer = MemorySaver()
+
         # Define state schema
         workflow = StateGraph(MessagesState)
 
-        # Define the model calling function
-        def call_model(state):
-            messages = state["messages"]
+        # Define the model calling function. The OpenAI client is streamed
+        # directly with the pre-serialized history, so LangChain does not
+        # re-convert every message on each turn; chunks go to the stream writer.
+        async def call_model(state, writer: StreamWriter):
             if not self.model:
                 return {
                     "messages": [
@@ -113,48 +228,194 @@ class AIAgent:
                     ]
                 }
 
-            response = self.model.invoke(messages)
-            return {"messages": [response]}
+            self._serialize_new_messages(state["messages"])
+            # The stream is closed even if the response is cancelled, so its
+            # HTTP connection is released right away
+            chunks = []
+            async with await self.model.async_client.create(
+                model=self.model.model_name,
+                messages=self._serialized_cache,
+                temperature=self.model.temperature,
+                stream=True,
+            ) as stream:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content = chunk.choices[0].delta.content
+                        chunks.append(content)
+                        writer(content)
+            writer(_RESPONSE_COMPLETE)
+
+            return {"messages": [AIMessage(content="".join(chunks))]}
+
+        # Collapse older turns into a single summary message once the history
+        # has grown enough. This runs as its own step after the response has
+        # been saved, so a failure or cancellation here cannot lose it.
+        async def summarize(state):
+            if not self.model:
+                return {}
+
+            # Tokenizing may load the encoding and takes a while for long
+            # messages, so it runs on a worker thread rather than the GUI thread
+            try:
+                needs_summary = await asyncio.to_thread(
+                    self._needs_summary, state["messages"]
+                )
+            except Exception:
+                logger.exception("Error counting chat history tokens")
+                return {}
+            if not needs_summary:
+                return {}
+
+            old_messages = state["messages"][: -self.KEEP_RECENT_TURNS * 2]
+            response = await self.summary_model.ainvoke(
+                [SystemMessage(content=SUMMARY_PROMPT), *old_messages]
+            )
+
+            # The history prefix changes, so the payload must be rebuilt
+            self._serialized_cache.clear()
+
+            # The summary takes over the first message's ID, so its cached
+            # token count no longer applies
+            self._token_counts.pop(old_messages[0].id, None)
+
+            # Replace the oldest message in place so the summary stays first
+            return {
+                "messages": [
+                    SystemMessage(content=response.content, id=old_messages[0].id),
+                    *[RemoveMessage(id=m.id) for m in old_messages[1:]],
+                ]
+            }
 
         # Add nodes and edges
         workflow.add_node("agent", call_model)
+        workflow.add_node("summarize", summarize)
         workflow.set_entry_point("agent")
-        workflow.add_edge("agent", END)
+        workflow.add_edge("agent", "summarize")
+        workflow.add_edge("summarize", END)
 
         # Compile graph
-        self.agent = workflow.compile()
+        self.agent = workflow.compile(checkpointer=self._checkpointer)
 
-    def process_message(self, user_input: str) -> str:
+    def _needs_summary(self, messages: List[Any]) -> bool:
         """
-        Process user message and get AI response.
+        Check whether the chat history should be summarized.
 
         Args:
-            user_input: The user's message
+            messages: The full chat history from the graph state
+
+        Returns:
+            bool: True if older turns should be collapsed into a summary
+        """
+        if len(messages) <= self.KEEP_RECENT_TURNS * 2:
+            return False
+        if len(messages) > self.MAX_TURNS * 2:
+            return True
+        return self._count_history_tokens(messages) > self.SUMMARY_TRIGGER_TOKENS
+
+    def _count_history_tokens(self, messages: List[Any]) -> int:
+        """
+        Count the tokens in the chat history, tokenizing only new messages.
+
+        Args:
+            messages: The full chat history from the graph state
+
+        Returns:
+            int: Approximate token count, including per-message framing
+        """
+        counts = {}
+        for message in messages:
+            count = self._token_counts.get(message.id)
+            if count is None:
+                count = self.model.get_num_tokens(message.content)
+            counts[message.id] = count
+
+        # Dropping summarized messages keeps the cache bounded by the history
+        self._token_counts = counts
+        return sum(counts.values()) + self.MESSAGE_OVERHEAD_TOKENS * len(counts)
+
+    async def _check_input_size(self, *texts: str) -> Optional[str]:
+        """
+        Check user input against the per-request token budget, so oversized
+        input is refused locally instead of by a slow, costly API call.
+
+        Args:
+            texts: The user input sent with the request
 
         Returns:
-            AI response as a string
+            A message for the user if the input is too long, otherwise None
+        """
+        # Every token covers at least one UTF-8 byte, so short input needs no
+        # tokenizing
+        if sum(len(text.encode("utf-8")) for text in texts) <= self.MAX_INPUT_TOKENS:
+            return None
+
+        # Long input takes a while to tokenize, so it is done on a worker
+        # thread to keep the GUI responsive
+        model = self.model
+        tokens = await asyncio.to_thread(
+            lambda: sum(model.get_num_tokens(text) for text in texts)
+        )
+        if tokens <= self.MAX_INPUT_TOKENS:
+            return None
+        return (
+            f"入力が長すぎます（{tokens:,}トークン、上限{self.MAX_INPUT_TOKENS:,}トークン）。"
+            "短くしてから送信してください。"
+        )
+
+    def _graph_config(self) -> Dict[str, Any]:
+        """Return the graph config selecting this agent's conversation thread"""
+        return {"configurable": {"thread_id": self._thread_id}}
+
+    async def stream_message(
+        self, user_input: str, on_complete: Optional[Callable[[], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Process user message and yield the AI response as it is generated.
+
+        Args:
+            user_input: The user's message
+            on_complete: Called once the response is complete. The history
+                may still be summarized before the iteration ends.
+
+        Yields:
+            Chunks of the AI response text
         """
         # Check for configuration updates before processing
         self._update_configuration()
 
         if not self.model:
-            return "APIキーが設定されていないため、応答できません。設定画面でAPIキーを設定してください。"
+            yield "APIキーが設定されていないため、応答できません。設定画面でAPIキーを設定してください。"
+            return
 
-        try:
-            # Add user message to history
-            self.messages.append(HumanMessage(content=user_input))
-
-            # Get response
-            result = self.agent.invoke({"messages": self.messages})
+        from langchain_core.messages import HumanMessage
 
-            # Extract response
-            ai_message = result["messages"][-1]
-            self.messages.append(ai_message)
-
-            return ai_message.content
+        completed = False
+        try:
+            too_long = await self._check_input_size(user_input)
+            if too_long:
+                yield too_long
+                return
+
+            # Only the new message is passed; the checkpointer restores history
+            async for chunk in self.agent.astream(
+                {"messages": [HumanMessage(content=user_input)]},
+                config=self._graph_config(),
+                stream_mode="custom",
+            ):
+                if chunk is _RESPONSE_COMPLETE:
+                    completed = True
+                    if on_complete:
+                        on_complete()
+                else:
+                    yield chunk
         except Exception as e:
-            print(f"Error getting AI response: {e}")
-            return f"エラーが発生しました: {str(e)}"
+            # A failure while summarizing the history does not affect the
+            # response, which has already been shown in full
+            if completed:
+                logger.exception("Error summarizing chat history")
+                return
+            logger.exception("Error getting AI response")
+            yield f"エラーが発生しました: {str(e)}"
 
 
 class DocumentAIAgent(AIAgent):
@@ -163,16 +424,70 @@ class DocumentAIAgent(AIAgent):
     Returns a structured response with both message and edited content.
     """
 
-    def process_document_request(
-        self, prompt: str, content: str, is_edit_mode: bool
+    # Response cache size and minimum cosine similarity for a fuzzy hit
+    CACHE_SIZE = 128
+    SIMILARITY_THRESHOLD = 0.95
+    EMBEDDING_MODEL = "text-embedding-3-small"
+
+    # Responses longer than this many characters are parsed on a worker thread
+    PARSE_IN_THREAD_THRESHOLD = 100_000
+
+    def __init__(self):
+        """
+        Initialize the Document AI Agent.
+        """
+        # Recent responses keyed by request hash, least recently used first.
+        # Values are (document key, prompt embedding, response).
+        self._cache: OrderedDict[
+            bytes, Tuple[bytes, Optional["np.ndarray"], DocumentResponse]
+        ] = OrderedDict()
+        self._embeddings = None
+
+        super().__init__()
+
+    def _update_configuration(self) -> bool:
+        """
+        Check and update configuration if settings have changed.
+
+        Returns:
+            bool: True if configuration was updated, False otherwise
+        """
+        if not super()._update_configuration():
+            return False
+
+        self._embeddings = None
+        if self.model:
+            try:
+                from langchain_openai import OpenAIEmbeddings
+
+                self._embeddings = OpenAIEmbeddings(
+                    api_key=self._current_api_key, model=self.EMBEDDING_MODEL
+                )
+            except Exception:
+                logger.exception("Error setting up embeddings")
+        return True
+
+    async def process_document_request(
+        self,
+        prompt: str,
+        content: str,
+        is_edit_mode: bool,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        bypass_cache: bool = False,
     ) -> DocumentResponse:
         """
         Process document request and return a structured response.
 
+        Identical prompts on the same document are answered from a cache of
+        recent responses, and so are near-identical questions.
+
         Args:
             prompt: The user's prompt/instruction
             content: The current document content
             is_edit_mode: Whether this is an edit request (True) or question (False)
+            on_chunk: Called with the response message text as it is generated.
+                Not called for cached responses.
+            bypass_cache: Always ask the model, replacing any cached response
 
         Returns:
             DocumentResponse containing message and optionally edited content
@@ -187,54 +502,218 @@ class DocumentAIAgent(AIAgent):
             )
 
         try:
-            # Prepare system message based on mode
-            if is_edit_mode:
-                system_message = SystemMessage(
-                    content="""あなたは書類作成アシスタントです。ユーザーの指示に従って提供されたテキストを編集してください。
-                    
-回答形式:
-1. 最初に編集内容の説明を記載してください。
-2. その後に明確な区切り「===編集後のテキスト===」を入れてください。
-3. その後に編集後のテキスト全体を記載してください。
-
-例:
-「文章を簡潔にしました。また、誤字を修正し、段落を整理しました。」
-
-===編集後のテキスト===
-（編集後のテキスト全体）
-"""
-                )
-            else:
-                system_message = SystemMessage(
-                    content="あなたは書類作成アシスタントです。ユーザーが提供したテキストについての質問に答えてください。"
-                )
-
-            # Prepare user message with content
-            user_input = f"{prompt}\n\n【テキスト】\n{content}"
-            user_message = HumanMessage(content=user_input)
-
-            # Reset history for each request to maintain context isolation
-            messages = [system_message, user_message]
+            too_long = await self._check_input_size(prompt, content)
+            if too_long:
+                return DocumentResponse(message=too_long, edited_content=None)
+
+            system = SYSTEM_EDIT if is_edit_mode else SYSTEM_QA
+
+            # Return a cached response for the same prompt
+            document_key = self._hash(self._current_model_name, system, content)
+            cache_key = self._hash(document_key, prompt)
+            if not bypass_cache and cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key][2]
+
+            # A similar question gets the same answer, but a similar edit
+            # instruction may ask for a different edit, so edits are only
+            # reused for the exact prompt. Questions are embedded before the
+            # request only when there is a cached answer to compare with;
+            # otherwise the embedding is computed alongside the request.
+            prompt_vector = None
+            embed_with_request = False
+            if not is_edit_mode:
+                if not bypass_cache and self._has_embedded(document_key):
+                    prompt_vector = await self._embed(prompt)
+                    cached = self._find_similar(document_key, prompt_vector)
+                    if cached:
+                        return cached
+                else:
+                    embed_with_request = True
 
             # Get response
-            response = self.model.invoke(messages)
+            request = self._request_raw(system, prompt, content, is_edit_mode, on_chunk)
+            if embed_with_request:
+                raw, prompt_vector = await asyncio.gather(request, self._embed(prompt))
+            else:
+                raw = await request
 
-            # Parse response for edit mode
-            if is_edit_mode:
-                message, edited_content = self._parse_edit_response(
-                    response.content, content
+            # Parsing copies the whole response, so keep large ones off the
+            # event loop thread
+            if len(raw) > self.PARSE_IN_THREAD_THRESHOLD:
+                result = await asyncio.to_thread(
+                    self._parse, raw, content, is_edit_mode
                 )
-                return DocumentResponse(message=message, edited_content=edited_content)
             else:
-                # For question mode, just return the response
-                return DocumentResponse(message=response.content, edited_content=None)
+                result = self._parse(raw, content, is_edit_mode)
+
+            self._store(cache_key, document_key, prompt_vector, result)
+            return result
 
         except Exception as e:
-            print(f"Error processing document request: {e}")
+            logger.exception("Error processing document request")
             return DocumentResponse(
                 message=f"エラーが発生しました: {str(e)}", edited_content=None
             )
 
+    async def _request_raw(
+        self,
+        system: str,
+        prompt: str,
+        content: str,
+        is_edit_mode: bool,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Send a document request to the model.
+
+        Args:
+            system: The system prompt for the processing mode
+            prompt: The user's prompt/instruction
+            content: The current document content
+            is_edit_mode: Whether this is an edit request (True) or question (False)
+            on_chunk: Called with the response message text as it is generated
+
+        Returns:
+            The raw response text
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        # Static instructions first, then the document, then the prompt, so
+        # repeated requests on the same document share a cacheable prefix
+        system_message = SystemMessage(content=system)
+        document_message = HumanMessage(content=f"【テキスト】\n{content}")
+        user_message = HumanMessage(content=prompt)
+
+        # Reset history for each request to maintain context isolation
+        messages = [system_message, document_message, user_message]
+
+        if on_chunk is None:
+            response = await self.model.ainvoke(messages)
+            return response.content
+
+        chunks = []
+        pending = ""
+        message_done = False
+        async for chunk in self.model.astream(messages):
+            chunks.append(chunk.content)
+            if message_done:
+                continue
+            pending += chunk.content
+
+            if not is_edit_mode:
+                text, pending = pending, ""
+            else:
+                # Only the explanation before the separator belongs in the
+                # message; hold back text that may be a partial separator
+                head, separator, _ = pending.partition(_EDIT_SEPARATOR)
+                if separator:
+                    text, pending, message_done = head, "", True
+                else:
+                    split = max(len(pending) - len(_EDIT_SEPARATOR) + 1, 0)
+                    text, pending = pending[:split], pending[split:]
+            if text:
+                on_chunk(text)
+
+        if pending:
+            on_chunk(pending)
+        return "".join(chunks)
+
+    def _parse(self, raw: str, content: str, is_edit_mode: bool) -> DocumentResponse:
+        """
+        Build the structured response from a raw model response.
+
+        Args:
+            raw: The raw response text
+            content: The original document content
+            is_edit_mode: Whether this is an edit request (True) or question (False)
+
+        Returns:
+            DocumentResponse containing message and optionally edited content
+        """
+        # Parse response for edit mode
+        if is_edit_mode:
+            message, edited_content = self._parse_edit_response(raw, content)
+            return DocumentResponse(message=message, edited_content=edited_content)
+
+        # For question mode, just return the response
+        return DocumentResponse(message=raw, edited_content=None)
+
+    @staticmethod
+    def _hash(*parts: Union[str, bytes]) -> bytes:
+        """Return a digest identifying the given request parts"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+            digest.update(b"\0")
+        return digest.digest()
+
+    async def _embed(self, prompt: str) -> Optional["np.ndarray"]:
+        """
+        Embed a prompt for similarity lookup.
+
+        Returns:
+            The normalized embedding, or None if embeddings are unavailable
+        """
+        if not self._embeddings:
+            return None
+
+        import numpy as np
+
+        try:
+            embedding = await self._embeddings.aembed_query(prompt)
+            vector = np.asarray(embedding, dtype=np.float32)
+            return vector / np.linalg.norm(vector)
+        except Exception:
+            logger.exception("Error embedding prompt")
+            return None
+
+    def _has_embedded(self, document_key: bytes) -> bool:
+        """Return whether a response with a prompt embedding is cached for a document"""
+        return any(
+            doc_key == document_key and vector is not None
+            for doc_key, vector, _ in self._cache.values()
+        )
+
+    def _find_similar(
+        self, document_key: bytes, prompt_vector: Optional["np.ndarray"]
+    ) -> Optional[DocumentResponse]:
+        """
+        Find a cached response for a similar prompt on the same document.
+
+        Returns:
+            The cached response, or None if no prompt is similar enough
+        """
+        if prompt_vector is None:
+            return None
+
+        import numpy as np
+
+        best_key, best_score = None, self.SIMILARITY_THRESHOLD
+        for key, (doc_key, vector, _) in self._cache.items():
+            if doc_key != document_key or vector is None:
+                continue
+            score = float(np.dot(vector, prompt_vector))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        self._cache.move_to_end(best_key)
+        return self._cache[best_key][2]
+
+    def _store(
+        self,
+        cache_key: bytes,
+        document_key: bytes,
+        prompt_vector: Optional["np.ndarray"],
+        response: DocumentResponse,
+    ):
+        """Add a response to the cache, evicting the least recently used"""
+        self._cache[cache_key] = (document_key, prompt_vector, response)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
     def _parse_edit_response(
         self, response: str, original_content: str
     ) -> Tuple[str, str]:
@@ -248,14 +727,12 @@ class DocumentAIAgent(AIAgent):
         Returns:
             Tuple of (message, edited_content)
         """
-        # Look for the separator
-        separator = "===編集後のテキスト==="
+        # Split at the first separator in a single pass
+        head, separator, tail = response.partition(_EDIT_SEPARATOR)
 
-        if separator in response:
-            # Split by the separator
-            parts = response.split(separator, 1)
-            message = parts[0].strip()
-            edited_content = parts[1].strip()
+        if separator:
+            message = head.strip()
+            edited_content = tail.strip()
         else:
             # If no separator found, treat whole response as the edited content
             # but also add a note in the message
@@ -3,11 +3,8 @@ AI Chat module for the PyQt6 desktop application.
 Provides a chat interface with an AI powered by LangGraph and OpenAI.
 """
 
-import os
-import sys
-from typing import Any, Dict, List, Optional
-from threading import Thread
-from queue import Queue
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
 from PyQt6.QtWidgets import (
     QWidget,
@@ -15,67 +12,151 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QTextEdit,
     QPushButton,
-    QScrollArea,
-    QFrame,
+    QListView,
+    QStyledItemDelegate,
+    QAbstractItemView,
     QSizePolicy,
-    QSpacerItem,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QIcon, QPixmap, QFont, QColor
-from PyQt6.QtCore import QObject, QEvent
+from PyQt6.QtCore import (
+    Qt,
+    QEvent,
+    QSize,
+    QSizeF,
+    QTimer,
+    QRectF,
+    QAbstractListModel,
+    QModelIndex,
+)
+from PyQt6.QtGui import (
+    QIcon,
+    QFont,
+    QColor,
+    QPainter,
+    QPalette,
+    QTextDocument,
+    QAbstractTextDocumentLayout,
+)
 
 # Import the AI agent
 from modules.ai_agent import AIAgent
+from modules.chat_helpers import FlushBuffer, ScrollFollower
+
 
+class ChatModel(QAbstractListModel):
+    """List model holding chat messages as (text, is_user) rows"""
 
-# Define message bubble widget for displaying chat messages
-class MessageBubble(QFrame):
-    """Widget for displaying chat messages as bubbles"""
+    IsUserRole = Qt.ItemDataRole.UserRole + 1
 
-    def __init__(self, message_text: str, is_user: bool, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.setObjectName("MessageBubble")
-        self.is_user = is_user
-
-        # Configure frame appearance
-        self.setFrameShape(QFrame.Shape.StyledPanel)
-        self.setFrameShadow(QFrame.Shadow.Raised)
-        self.setStyleSheet(
-            f"background-color: {'#e1ffc7' if is_user else '#ffffff'}; "
-            f"border-radius: 10px; "
-            f"padding: 5px; "
-            f"margin: 0px 5px 0px 5px; "
-        )
+        self._rows: List[List[Any]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of messages"""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return the message text or sender for the given row"""
+        if not index.isValid():
+            return None
+        text, is_user = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == self.IsUserRole:
+            return is_user
+        return None
+
+    def append_message(self, text: str, is_user: bool) -> int:
+        """Append a message and return its row"""
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append([text, is_user])
+        self.endInsertRows()
+        return row
+
+    def append_text(self, row: int, text: str):
+        """Append text to the message at the given row"""
+        self._rows[row][0] += text
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+
+class BubbleDelegate(QStyledItemDelegate):
+    """Delegate painting chat messages as bubbles"""
+
+    USER_COLOR = QColor("#e1ffc7")
+    AI_COLOR = QColor("#ffffff")
+    TEXT_COLOR = QColor("#222222")
+
+    # Bubble geometry
+    PADDING = 10
+    MARGIN = 5
+    SPACING = 15
+    RADIUS = 10
+    WIDTH_RATIO = 0.8
 
-        # Create layout
-        layout = QVBoxLayout()
-        layout.setContentsMargins(2, 2, 2, 2)
-
-        # Add message text
-        self.message = QTextEdit()
-        self.message.setReadOnly(True)
-        self.message.setText(message_text)
-        # 文字色を濃いグレー(#222222)に設定（真っ黒より少し明るい）
-        self.message.setStyleSheet(
-            "background-color: transparent; border: none; color: #222222; padding: 0px;"
-        )
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
-        # Adjust the message height based on content
-        self.message.document().documentLayout().documentSizeChanged.connect(
-            self.adjust_text_edit_height
+        # One document reused to lay out every message
+        self._document = QTextDocument(self)
+        self._document.setDocumentMargin(0)
+
+        # Paint context drawing every message in the text color
+        self._paint_context = QAbstractTextDocumentLayout.PaintContext()
+        self._paint_context.palette.setColor(QPalette.ColorRole.Text, self.TEXT_COLOR)
+
+        # Laid-out text height per row, with the text and view width it was
+        # computed for, so unchanged rows are not laid out again
+        self._heights: Dict[int, Tuple[str, int, float]] = {}
+
+    def _layout(self, text: str, font: QFont, width: int) -> QTextDocument:
+        """Lay out text for a bubble in a view of the given width"""
+        max_text_width = int(width * self.WIDTH_RATIO) - 2 * self.PADDING
+        self._document.setDefaultFont(font)
+        self._document.setPlainText(text)
+        self._document.setTextWidth(max(max_text_width, 1))
+        return self._document
+
+    def sizeHint(self, option, index):
+        """Return the size of the bubble for the given message"""
+        width = self.parent().viewport().width()
+        text = index.data()
+        cached = self._heights.get(index.row())
+        if cached and cached[1] == width and cached[0] == text:
+            text_height = cached[2]
+        else:
+            text_height = self._layout(text, option.font, width).size().height()
+            self._heights[index.row()] = (text, width, text_height)
+        height = text_height + 2 * self.PADDING + self.SPACING
+        return QSize(width, int(height) + 1)
+
+    def paint(self, painter, option, index):
+        """Paint the bubble and its text"""
+        is_user = index.data(ChatModel.IsUserRole)
+        rect = option.rect
+        document = self._layout(index.data(), option.font, rect.width())
+
+        # Size the bubble to its text and align it to the sender's side
+        bubble_width = document.idealWidth() + 2 * self.PADDING
+        bubble_height = document.size().height() + 2 * self.PADDING
+        if is_user:
+            x = rect.right() - self.MARGIN - bubble_width
+        else:
+            x = rect.left() + self.MARGIN
+        y = rect.top() + self.SPACING / 2
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.USER_COLOR if is_user else self.AI_COLOR)
+        painter.drawRoundedRect(
+            QRectF(x, y, bubble_width, bubble_height), self.RADIUS, self.RADIUS
         )
 
-        layout.addWidget(self.message)
-        self.setLayout(layout)
-
-        # Set maximum width based on parent
-        if parent:
-            self.setMaximumWidth(int(parent.width() * 0.8))
-
-    def adjust_text_edit_height(self):
-        """Adjust QTextEdit height based on content"""
-        doc_height = self.message.document().size().height()
-        self.message.setFixedHeight(int(doc_height + 5))
+        painter.translate(x + self.PADDING, y + self.PADDING)
+        document.documentLayout().draw(painter, self._paint_context)
+        painter.restore()
 
 
 class AutoResizingTextEdit(QTextEdit):
@@ -89,54 +170,66 @@ class AutoResizingTextEdit(QTextEdit):
         self.setMaximumHeight(max_height)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
 
-        # Connect document size changes to height adjustment
-        self.document().documentLayout().documentSizeChanged.connect(self.adjust_height)
+        # Height last applied, and the document height reported by the layout
+        self._last_height = -1
+        self._doc_height = 0.0
+
+        # Connect document size changes to height adjustment, at most once per frame
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(16)
+        self.resize_timer.timeout.connect(self.adjust_height)
+        self.document().documentLayout().documentSizeChanged.connect(
+            self._on_document_size_changed
+        )
+
+    def _on_document_size_changed(self, size: QSizeF):
+        """Remember the new document size and schedule a height adjustment"""
+        self._doc_height = size.height()
+        self.resize_timer.start()
 
     def adjust_height(self):
         """Adjust height based on content, within specified bounds"""
-        doc_height = self.document().size().height()
-        height = max(self.min_height, min(int(doc_height + 10), self.max_height))
-        self.setFixedHeight(height)
+        height = max(self.min_height, min(int(self._doc_height + 10), self.max_height))
 
+        # Skip unchanged heights, which would still invalidate the input row
+        if height != self._last_height:
+            self._last_height = height
+            self.setFixedHeight(height)
 
-class ChatHistory(QScrollArea):
-    """Scrollable area for displaying chat history"""
+
+class ChatHistory(QListView):
+    """List view for displaying chat history; only visible messages are laid out"""
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWidgetResizable(True)
-
-        # Create container widget
-        self.container = QWidget()
-        self.layout = QVBoxLayout(self.container)
-        self.layout.setSpacing(15)
-        self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.layout.addStretch()
+        self.chat_model = ChatModel(self)
+        self.setModel(self.chat_model)
+        self.setItemDelegate(BubbleDelegate(self))
 
-        self.setWidget(self.container)
+        # Display-only list that re-wraps messages when resized
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.viewport().setBackgroundRole(QPalette.ColorRole.Window)
 
-    def add_message(self, message_text: str, is_user: bool):
-        """Add a message to the chat history"""
-        # Create message layout
-        msg_layout = QHBoxLayout()
-        msg_layout.setContentsMargins(0, 0, 0, 0)
+        # Stay on the latest message while scrolled to the bottom
+        self.follower = ScrollFollower(self.verticalScrollBar())
 
-        # Create message bubble
-        message = MessageBubble(message_text, is_user, self)
-
-        # Add spacer and message to align left/right
-        if is_user:
-            msg_layout.addStretch()
-            msg_layout.addWidget(message)
-        else:
-            msg_layout.addWidget(message)
-            msg_layout.addStretch()
+    def add_message(self, message_text: str, is_user: bool) -> int:
+        """
+        Add a message to the chat history and return its row.
+        The view follows the new message only if it is scrolled to the bottom.
+        """
+        return self.chat_model.append_message(message_text, is_user)
 
-        # Insert message before the stretch
-        self.layout.insertLayout(self.layout.count() - 1, msg_layout)
+    def append_text(self, row: int, text: str):
+        """Append text to the message at the given row"""
+        self.chat_model.append_text(row, text)
 
-        # Scroll to bottom
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        # The message size changed, so the rows must be laid out again
+        self.itemDelegate().sizeHintChanged.emit(self.chat_model.index(row))
 
 
 class AIChat(QWidget):
@@ -145,8 +238,16 @@ class AIChat(QWidget):
     Uses LangGraph and OpenAI for chat functionality.
     """
 
-    # Signal for background AI responses
-    response_received = pyqtSignal(str)
+    # Send button icon, shared by all instances and created on first use
+    _send_icon: Optional[QIcon] = None
+
+    @classmethod
+    def _get_send_icon(cls) -> QIcon:
+        """Return the up arrow icon for the send button"""
+        if cls._send_icon is None:
+            icon = QIcon(":/icons/send.png")
+            cls._send_icon = icon if icon.availableSizes() else QIcon.fromTheme("go-up")
+        return cls._send_icon
 
     def __init__(self, parent=None):
         """
@@ -158,11 +259,19 @@ class AIChat(QWidget):
         super().__init__(parent)
         self.setup_ui()
 
-        # Create AI agent instance
+        # Create AI agent instance, building it once the event loop is idle
         self.ai_agent = AIAgent()
+        QTimer.singleShot(0, self.ai_agent.ensure_ready)
 
-        # Connect signal to slot
-        self.response_received.connect(self.on_ai_response)
+        # Turns of one conversation depend on each other, so responses are
+        # streamed one at a time in the order messages were sent
+        self.response_lock = asyncio.Lock()
+
+        # Keep references to running tasks until they complete
+        self.tasks = set()
+
+        # Task streaming the latest response, cancelled by the next message
+        self.current_task: Optional[asyncio.Task] = None
 
     def setup_ui(self):
         """
@@ -176,6 +285,7 @@ class AIChat(QWidget):
 
         # Input area
         input_layout = QHBoxLayout()
+        input_layout.setSpacing(6)
 
         # Text input
         self.text_input = AutoResizingTextEdit(min_height=50, max_height=120)
@@ -186,11 +296,12 @@ class AIChat(QWidget):
 
         # Send button
         self.send_button = QPushButton()
-        self.send_button.setIcon(self.create_up_arrow_icon())
+        self.send_button.setIcon(self._get_send_icon())
         self.send_button.setFixedSize(50, 50)
-        self.send_button.setStyleSheet(
-            "background-color: #128C7E; border-radius: 25px;"
+        self.send_button.setSizePolicy(
+            QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed
         )
+        self.send_button.setObjectName("SendButton")
         self.send_button.clicked.connect(self.send_message)
 
         # Add widgets to layout
@@ -206,17 +317,6 @@ class AIChat(QWidget):
             False,
         )
 
-    def create_up_arrow_icon(self):
-        """Create an up arrow icon for the send button"""
-        # Create a simple up arrow using QPixmap
-        pixmap = QPixmap(32, 32)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        return (
-            QIcon(":/icons/send.png")
-            if QIcon(":/icons/send.png").availableSizes()
-            else QIcon.fromTheme("go-up")
-        )
-
     def eventFilter(self, obj, event):
         """Handle events for child widgets"""
         if obj is self.text_input and event.type() == QEvent.Type.KeyPress:
@@ -235,24 +335,59 @@ class AIChat(QWidget):
         if not message:
             return
 
-        # Add user message to chat history
+        # Add user message to chat history, with an empty message to stream
+        # the response into. Sending brings the view back to the latest message.
         self.chat_history.add_message(message, True)
+        row = self.chat_history.add_message("", False)
+        self.chat_history.follower.scroll_to_bottom()
 
         # Clear input
         self.text_input.clear()
 
-        # Process message in background thread
-        self.process_message_async(message)
-
-    def process_message_async(self, message):
-        """Process the message in a background thread"""
-
-        def _process():
-            response = self.ai_agent.process_message(message)
-            self.response_received.emit(response)
-
-        Thread(target=_process, daemon=True).start()
+        # Process message on the event loop
+        self.process_message_async(message, row)
+
+    def process_message_async(self, message, row):
+        """Schedule the message to be processed on the asyncio event loop"""
+        # A new message supersedes the response still being generated
+        if self.current_task and not self.current_task.done():
+            self.current_task.cancel()
+
+        task = asyncio.create_task(self.stream_response(message, row))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        self.current_task = task
+
+    async def stream_response(self, message, row):
+        """Stream the AI response into the message at the given row"""
+        # Set once the message has been passed to the agent, and once the
+        # response is complete. A response is not interrupted if the task is
+        # cancelled while the history is being summarized afterwards.
+        sent = False
+        finished = False
+
+        def on_complete():
+            nonlocal finished
+            finished = True
+
+        # Streamed text is added to the message in batches to limit relayouts
+        buffer = FlushBuffer(
+            lambda text: self.chat_history.append_text(row, text), self
+        )
 
-    def on_ai_response(self, response):
-        """Handle AI response from background thread"""
-        self.chat_history.add_message(response, False)
+        try:
+            async with self.response_lock:
+                sent = True
+                async for chunk in self.ai_agent.stream_message(message, on_complete):
+                    buffer.append(chunk)
+        except asyncio.CancelledError:
+            # A message still waiting for the previous response never reaches
+            # the agent or the conversation history
+            if not sent:
+                buffer.append("（送信されませんでした）")
+            elif not finished:
+                buffer.append("（応答を中断しました）")
+            raise
+        finally:
+            buffer.flush()
+            buffer.deleteLater()
@@ -0,0 +1,92 @@
+"""
+Chat helpers for the PyQt6 desktop application.
+Provides behavior shared by the chat histories of the AI chat and the
+document creator.
+"""
+
+from typing import Callable, List
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QScrollBar
+
+
+class ScrollFollower(QObject):
+    """
+    Keeps a scrolled view on its latest content while it is scrolled to the
+    bottom. Scrolling up stops following until scroll_to_bottom is called.
+    """
+
+    def __init__(self, scroll_bar: QScrollBar):
+        """
+        Initialize the follower.
+
+        Args:
+            scroll_bar: Vertical scroll bar of the view, which owns the follower
+        """
+        super().__init__(scroll_bar)
+        self._scroll_bar = scroll_bar
+
+        # The scroll range is only final once the content has been laid out,
+        # so the view is moved to the bottom whenever the range grows
+        self._at_bottom = True
+        scroll_bar.valueChanged.connect(self._on_scrolled)
+        scroll_bar.rangeChanged.connect(self._on_range_changed)
+
+    def _on_scrolled(self, value: int):
+        """Track whether the view is scrolled to the bottom"""
+        self._at_bottom = value == self._scroll_bar.maximum()
+
+    def _on_range_changed(self, _minimum: int, maximum: int):
+        """Keep the view at the bottom as the content grows"""
+        if self._at_bottom:
+            self._scroll_bar.setValue(maximum)
+
+    def scroll_to_bottom(self):
+        """Scroll to the latest content and keep following it"""
+        self._at_bottom = True
+        self._scroll_bar.setValue(self._scroll_bar.maximum())
+
+
+class FlushBuffer(QObject):
+    """
+    Collects streamed text and passes it on once per flush interval rather
+    than once per token, to limit relayouts of the view showing it.
+    """
+
+    # Interval at which collected text is passed on (ms)
+    FLUSH_INTERVAL = 30
+
+    def __init__(self, on_flush: Callable[[str], None], parent=None):
+        """
+        Initialize the buffer.
+
+        Args:
+            on_flush: Called with the text collected since the last flush
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._on_flush = on_flush
+        self._chunks: List[str] = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FLUSH_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    def append(self, text: str):
+        """Add streamed text, to be passed on with the next flush"""
+        self._chunks.append(text)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Pass on all collected text now"""
+        self._timer.stop()
+        if self._chunks:
+            text = "".join(self._chunks)
+            self._chunks.clear()
+            self._on_flush(text)
+
+    def discard(self):
+        """Drop the collected text without passing it on"""
+        self._timer.stop()
+        self._chunks.clear()
@@ -1,19 +1,56 @@
 """
 Configuration module for the PyQt6 desktop application.
-Uses pydantic-settings to manage application settings.
+Loads application settings from environment variables and the .env file.
 """
 
 import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from PyQt6.QtCore import QObject, pyqtSignal
 
 
-class AppConfig(BaseSettings):
+def _read_env_file(env_path: Path) -> Dict[str, str]:
+    """
+    Read KEY=VALUE settings from a .env file.
+
+    Args:
+        env_path: Path to the .env file
+
+    Returns:
+        Settings by upper-case key; empty if the file does not exist
+    """
+    values = {}
+    if not env_path.is_file():
+        return values
+
+    for line in env_path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+
+        key, _, value = line.partition("=")
+        key = key.strip().removeprefix("export ").strip()
+        value = value.strip()
+
+        # Quoted values are taken verbatim; unquoted ones may end in a comment
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+
+        values[key.upper()] = value
+    return values
+
+
+@dataclass(slots=True)
+class AppConfig:
     """
     Application configuration class.
-    Uses pydantic-settings to manage environment variables and configuration.
+    Environment variables take precedence over the .env file, which takes
+    precedence over the defaults below. Keys are case-insensitive.
     """
 
     # OpenAI API settings
@@ -23,13 +60,65 @@ class AppConfig(BaseSettings):
     # Application paths
     APP_DIR: Path = Path(__file__).parent.parent.parent
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore",
-        case_sensitive=False,
-    )
+    @classmethod
+    def load(cls, env_file: Path = Path(".env")) -> "AppConfig":
+        """
+        Create the configuration from the environment and the .env file.
+
+        Args:
+            env_file: Path to the .env file
+
+        Returns:
+            The loaded configuration
+        """
+        values = _read_env_file(env_file)
+        values.update((key.upper(), value) for key, value in os.environ.items())
+
+        settings = {}
+        for field in fields(cls):
+            if field.name in values:
+                value = values[field.name]
+                settings[field.name] = Path(value) if field.type is Path else value
+        return cls(**settings)
+
+
+class ConfigSignals(QObject):
+    """
+    Signals for configuration changes.
+    Emitted by the settings dialog after saving so consumers need not poll.
+    """
+
+    config_changed = pyqtSignal()
 
 
 # Create a global instance of the config
-config = AppConfig()
+config = AppConfig.load()
+
+# Create a global instance of the config signals
+config_signals = ConfigSignals()
+
+
+@lru_cache(maxsize=4)
+def get_chat_model(api_key: str, model_name: str, temperature: float) -> Any:
+    """
+    Return a shared chat model client for the given settings.
+
+    Agents asking for the same settings get the same client, so they share
+    its HTTP connection pool instead of each opening their own.
+
+    Args:
+        api_key: The OpenAI API key
+        model_name: The OpenAI model name
+        temperature: The sampling temperature
+
+    Returns:
+        A ChatOpenAI instance
+    """
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        api_key=api_key,
+        model=model_name,
+        temperature=temperature,
+        streaming=True,
+    )
@@ -3,10 +3,11 @@ Document Creator module for the PyQt6 desktop application.
 Provides a document creation interface with AI-powered editing and assistance.
 """
 
-import os
-from typing import Literal, Optional, Dict, Any, Union
+import asyncio
+import difflib
+import itertools
+from typing import Tuple
 from enum import Enum
-from threading import Thread
 
 from PyQt6.QtWidgets import (
     QWidget,
@@ -17,80 +18,36 @@ from PyQt6.QtWidgets import (
     QSplitter,
     QComboBox,
     QLabel,
-    QFrame,
-    QSizePolicy,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QFont, QTextCursor
-
-from pydantic import BaseModel, Field
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QTextBlockFormat, QTextCursor
 
 # Import AI agent for document processing
 from modules.ai_agent import DocumentAIAgent, DocumentResponse
+from modules.chat_helpers import FlushBuffer, ScrollFollower
 
 
-class ProcessingMode(str, Enum):
-    """Enum for processing modes"""
-
-    ASK = "ask"
-    EDIT = "edit"
+def _message_block_format(alignment: Qt.AlignmentFlag) -> QTextBlockFormat:
+    """Return the chat history block format for messages with the given alignment"""
+    block_format = QTextBlockFormat()
+    block_format.setAlignment(alignment)
+    block_format.setTopMargin(5)
+    block_format.setBottomMargin(5)
+    block_format.setLeftMargin(5)
+    block_format.setRightMargin(5)
+    return block_format
 
 
-class DocumentRequest(BaseModel):
-    """
-    Request model for document processing
-    """
+# Chat history block formats for user and AI messages
+_USER_BLOCK_FORMAT = _message_block_format(Qt.AlignmentFlag.AlignRight)
+_AI_BLOCK_FORMAT = _message_block_format(Qt.AlignmentFlag.AlignLeft)
 
-    mode: ProcessingMode
-    prompt: str
-    content: str = Field(default="")
 
+class ProcessingMode(str, Enum):
+    """Enum for processing modes"""
 
-class ChatBubble(QFrame):
-    """Widget for displaying chat messages in the Document Creator"""
-
-    def __init__(self, message_text: str, is_user: bool, parent=None):
-        super().__init__(parent)
-        self.setObjectName("ChatBubble")
-
-        # Configure frame appearance
-        self.setFrameShape(QFrame.Shape.StyledPanel)
-        self.setFrameShadow(QFrame.Shadow.Raised)
-        self.setStyleSheet(
-            # f"background-color: {'#e1ffc7' if is_user else '#ffffff'}; "
-            f"border-radius: 10px; "
-            f"padding: 5px; "
-            f"margin: 0px 5px 0px 5px; "
-        )
-
-        # Create layout
-        layout = QVBoxLayout()
-        layout.setContentsMargins(2, 2, 2, 2)
-
-        # Add message text
-        self.message = QTextEdit()
-        self.message.setReadOnly(True)
-        self.message.setText(message_text)
-        self.message.setStyleSheet(
-            "background-color: transparent; border: none; color: #222222; padding: 0px;"
-        )
-
-        # Adjust height based on content
-        self.message.document().documentLayout().documentSizeChanged.connect(
-            self.adjust_text_edit_height
-        )
-
-        layout.addWidget(self.message)
-        self.setLayout(layout)
-
-        # Set maximum width based on parent
-        if parent:
-            self.setMaximumWidth(int(parent.width() * 0.8))
-
-    def adjust_text_edit_height(self):
-        """Adjust QTextEdit height based on content"""
-        doc_height = self.message.document().size().height()
-        self.message.setFixedHeight(int(doc_height + 5))
+    ASK = "ask"
+    EDIT = "edit"
 
 
 class DocumentCreator(QWidget):
@@ -104,7 +61,7 @@ class DocumentCreator(QWidget):
     - Support for AI-powered document editing based on user instructions
     """
 
-    # Signal for background AI responses
+    # Signal for completed AI responses
     response_received = pyqtSignal(DocumentResponse)
 
     def __init__(self, parent=None):
@@ -115,9 +72,18 @@ class DocumentCreator(QWidget):
             parent: Parent widget
         """
         super().__init__(parent)
-        self.ai_agent = DocumentAIAgent()
         self.setup_ui()
 
+        # Create AI agent instance, building it once the event loop is idle
+        self.ai_agent = DocumentAIAgent()
+        QTimer.singleShot(0, self.ai_agent.ensure_ready)
+
+        # Keep references to running tasks until they complete
+        self.tasks = set()
+
+        # Mode, prompt and document text of the last request, for regenerating
+        self.last_request = None
+
         # Connect signal to slots
         self.response_received.connect(self.on_ai_response)
 
@@ -136,8 +102,13 @@ class DocumentCreator(QWidget):
         # Chat history - messages area
         self.chat_history = QTextEdit()
         self.chat_history.setReadOnly(True)
+        # The history is never edited by the user, so keep no undo stack
+        self.chat_history.setUndoRedoEnabled(False)
         chat_layout.addWidget(self.chat_history)
 
+        # Follow new messages while the history is scrolled to the bottom
+        self.history_follower = ScrollFollower(self.chat_history.verticalScrollBar())
+
         # Mode selector
         mode_layout = QHBoxLayout()
         mode_label = QLabel("モード:")
@@ -155,10 +126,20 @@ class DocumentCreator(QWidget):
         self.chat_input.setMaximumHeight(100)
         chat_layout.addWidget(self.chat_input)
 
-        # Send button
+        # Buttons to regenerate the last response and to send a request
+        button_layout = QHBoxLayout()
+        self.regenerate_button = QPushButton("再生成")
+        self.regenerate_button.setToolTip(
+            "直前の依頼をキャッシュを使わずに再送信します"
+        )
+        self.regenerate_button.setEnabled(False)
+        self.regenerate_button.clicked.connect(self.regenerate_response)
+        button_layout.addWidget(self.regenerate_button)
+
         self.send_button = QPushButton("送信")
         self.send_button.clicked.connect(self.process_request)
-        chat_layout.addWidget(self.send_button)
+        button_layout.addWidget(self.send_button, 1)
+        chat_layout.addLayout(button_layout)
 
         # Right side - Document editor
         self.editor_widget = QWidget()
@@ -186,37 +167,46 @@ class DocumentCreator(QWidget):
         cursor = self.chat_history.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
 
+        # Group the changes so the document is laid out once
+        cursor.beginEditBlock()
+
         # Set alignment based on who's sending the message
-        format = cursor.blockFormat()
+        cursor.setBlockFormat(_USER_BLOCK_FORMAT if is_user else _AI_BLOCK_FORMAT)
+
+        # Insert the text as plain text and a new line
+        cursor.insertText(text)
+        cursor.insertBlock()
+        cursor.endEditBlock()
+
+        # Sending a message brings the history back to the latest message
         if is_user:
-            format.setAlignment(Qt.AlignmentFlag.AlignRight)
-        else:
-            format.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        cursor.setBlockFormat(format)
-
-        # Create message bubble with background color and styling
-        bubble_style = (
-            "border-radius: 10px; padding: 5px;"
-            if is_user
-            else "border-radius: 10px; padding: 5px;"
-        )
-        message_html = f"""
-        <div style="{bubble_style}; margin: 5px; display: inline-block; max-width: 80%; text-align: left;">
-            {text}
-        </div>
+            self.history_follower.scroll_to_bottom()
+
+    def begin_streamed_message(self) -> Tuple[QTextCursor, QTextCursor]:
         """
+        Add an empty AI message whose text is filled in as it arrives.
 
-        # Insert HTML and a new line
-        cursor.insertHtml(message_html)
-        cursor.insertBlock()
+        Returns:
+            Cursors at the start and the end of the message text
+        """
+        end = self.chat_history.textCursor()
+        end.movePosition(QTextCursor.MoveOperation.End)
+        end.beginEditBlock()
+        end.setBlockFormat(_AI_BLOCK_FORMAT)
 
-        # Set cursor position to the end
-        self.chat_history.setTextCursor(cursor)
+        # Messages added while this one streams go into the following block
+        end.insertBlock()
+        end.endEditBlock()
+        end.movePosition(QTextCursor.MoveOperation.PreviousBlock)
 
-        # Scroll to bottom
-        self.chat_history.verticalScrollBar().setValue(
-            self.chat_history.verticalScrollBar().maximum()
-        )
+        start = QTextCursor(end)
+        start.setKeepPositionOnInsert(True)
+        return start, end
+
+    def finish_streamed_message(self, start: QTextCursor, end: QTextCursor, text: str):
+        """Replace the streamed text of an AI message with its final text"""
+        end.setPosition(start.position(), QTextCursor.MoveMode.KeepAnchor)
+        end.insertText(text)
 
     def process_request(self):
         """Process the user request based on selected mode"""
@@ -234,41 +224,112 @@ class DocumentCreator(QWidget):
         # Clear input
         self.chat_input.clear()
 
-        # Create request model
-        request = DocumentRequest(mode=mode, prompt=prompt, content=content)
+        self.last_request = (mode, prompt, content)
+        self.regenerate_button.setEnabled(True)
 
-        # Process in background thread
-        self.process_in_background(request)
+        # Process on the event loop
+        self.start_processing(mode, prompt, content)
 
-    def process_in_background(self, request: DocumentRequest):
-        """Process document request in a background thread"""
+    def regenerate_response(self):
+        """Send the last request again, getting a fresh response from the model"""
+        if self.last_request is None:
+            return
 
-        def _process():
-            try:
-                # Process with DocumentAIAgent
-                is_edit_mode = request.mode == ProcessingMode.EDIT
-                response = self.ai_agent.process_document_request(
-                    prompt=request.prompt,
-                    content=request.content,
-                    is_edit_mode=is_edit_mode,
-                )
+        mode, prompt, content = self.last_request
+        self.add_message(prompt, True)
+        self.start_processing(mode, prompt, content, bypass_cache=True)
+
+    def start_processing(
+        self,
+        mode: ProcessingMode,
+        prompt: str,
+        content: str,
+        bypass_cache: bool = False,
+    ):
+        """Schedule the document request to be processed on the event loop"""
+        # The reply goes right below its prompt even if more prompts follow
+        start, end = self.begin_streamed_message()
+        task = asyncio.create_task(
+            self.process(mode, prompt, content, start, end, bypass_cache)
+        )
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def process(
+        self,
+        mode: ProcessingMode,
+        prompt: str,
+        content: str,
+        start: QTextCursor,
+        end: QTextCursor,
+        bypass_cache: bool = False,
+    ):
+        """Process the document request, streaming the message as it arrives"""
+        # Streamed text is inserted in batches to limit relayouts
+        buffer = FlushBuffer(end.insertText, self)
+
+        try:
+            # Process with DocumentAIAgent
+            is_edit_mode = mode is ProcessingMode.EDIT
+            response = await self.ai_agent.process_document_request(
+                prompt=prompt,
+                content=content,
+                is_edit_mode=is_edit_mode,
+                on_chunk=buffer.append,
+                bypass_cache=bypass_cache,
+            )
+        except Exception as e:
+            response = DocumentResponse(
+                message=f"エラーが発生しました: {str(e)}", edited_content=None
+            )
+
+        # The parsed message may differ from the streamed text, e.g. when
+        # surrounding whitespace is stripped or the response was cached
+        buffer.discard()
+        buffer.deleteLater()
+        self.finish_streamed_message(start, end, response.message)
+        self.response_received.emit(response)
 
-                # Send response to main thread
-                self.response_received.emit(response)
+    def on_ai_response(self, response: DocumentResponse):
+        """Handle a completed AI response"""
+        # The message is already in the chat history from streaming.
+        # If there's edited content, update the document editor
+        if response.edited_content:
+            self.apply_edited_content(response.edited_content)
+
+    def apply_edited_content(self, edited_content: str):
+        """
+        Update the document editor to the edited text, replacing only the lines
+        that differ. Keeps the undo history, and the edit is one undo step.
+
+        Args:
+            edited_content: The full edited document text
+        """
+        old_text = self.document_editor.toPlainText()
+        if old_text == edited_content:
+            return
 
-            except Exception as e:
-                error_response = DocumentResponse(
-                    message=f"エラーが発生しました: {str(e)}", edited_content=None
-                )
-                self.response_received.emit(error_response)
+        old_lines = old_text.splitlines(keepends=True)
+        new_lines = edited_content.splitlines(keepends=True)
 
-        Thread(target=_process, daemon=True).start()
+        # Document positions of line starts; Qt counts UTF-16 code units
+        positions = list(
+            itertools.accumulate(
+                (len(line.encode("utf-16-le")) // 2 for line in old_lines),
+                initial=0,
+            )
+        )
 
-    def on_ai_response(self, response: DocumentResponse):
-        """Handle AI response from background thread"""
-        # Always display the message in chat history
-        self.add_message(response.message, False)
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        cursor = QTextCursor(self.document_editor.document())
+        cursor.beginEditBlock()
 
-        # If there's edited content, update the document editor
-        if response.edited_content:
-            self.document_editor.setText(response.edited_content)
+        # Apply from the end so earlier positions stay valid
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                continue
+            cursor.setPosition(positions[i1])
+            cursor.setPosition(positions[i2], QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText("".join(new_lines[j1:j2]))
+
+        cursor.endEditBlock()
@@ -13,9 +13,14 @@ from PyQt6.QtWidgets import (
     QScrollArea,
     QMessageBox,
 )
-from PyQt6.QtGui import QPixmap, QImage
-from PyQt6.QtCore import Qt
-import os
+from PyQt6.QtGui import QPixmap, QImageReader
+from PyQt6.QtCore import Qt, QTimer
+from collections import OrderedDict
+
+
+def _pixmap_bytes(pixmap):
+    """Return the approximate memory used by a pixmap's pixels"""
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
 
 
 class ImageViewer(QWidget):
@@ -24,6 +29,13 @@ class ImageViewer(QWidget):
     Provides a simple interface for opening and viewing image files.
     """
 
+    # Delay after the last zoom step before re-rendering with smoothing (ms)
+    SMOOTH_DELAY = 150
+
+    # Total size of the smoothly scaled pixmaps kept for recently used zoom
+    # factors, in bytes. A zoomed-in large photo alone can take hundreds of MB.
+    SCALED_CACHE_BYTES = 128 * 1024 * 1024
+
     def __init__(self, parent=None):
         """
         Initialize the Image Viewer widget.
@@ -34,6 +46,20 @@ class ImageViewer(QWidget):
         super().__init__(parent)
         self.current_image_path = None
         self.zoom_factor = 1.0
+
+        # Smoothly scaled pixmaps keyed by rounded zoom factor, and their size
+        self._scaled_cache = OrderedDict()
+        self._scaled_cache_bytes = 0
+
+        # Downscaled copy of a large image, used as the source for small zooms
+        self._preview = None
+
+        # Zooming renders fast first and smooth once the user pauses
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(self.SMOOTH_DELAY)
+        self._zoom_timer.timeout.connect(self.update_image)
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -112,43 +138,110 @@ class ImageViewer(QWidget):
         Args:
             file_path: Path to the image file
         """
-        self.image = QImage(file_path)
-        if self.image.isNull():
-            raise ValueError("Invalid image format")
+        # Decode straight into the pixmap; no separate QImage copy is kept
+        reader = QImageReader(file_path)
+        pixmap = QPixmap.fromImageReader(reader)
+        if pixmap.isNull():
+            raise ValueError(reader.errorString())
+
+        self.original_pixmap = pixmap
+        self._scaled_cache.clear()
+        self._scaled_cache_bytes = 0
+
+        # Zooming out of a large image scales from a copy twice the viewport
+        # size instead of from the full resolution image
+        preview_size = self.scroll_area.viewport().size() * 2
+        if (
+            self.original_pixmap.width() > preview_size.width()
+            or self.original_pixmap.height() > preview_size.height()
+        ):
+            self._preview = self.original_pixmap.scaled(
+                preview_size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        else:
+            self._preview = None
 
-        self.original_pixmap = QPixmap.fromImage(self.image)
         self.update_image()
 
-    def update_image(self):
+    def update_image(self, smooth=True):
         """
         Update the displayed image based on the current zoom factor.
+
+        Args:
+            smooth: Whether to scale with smoothing rather than fast scaling
         """
         if hasattr(self, "original_pixmap"):
+            self._zoom_timer.stop()
+
+            key = round(self.zoom_factor, 2)
+            if key == 1.0:
+                self.image_label.setPixmap(self.original_pixmap)
+                return
+
+            if key in self._scaled_cache:
+                self._scaled_cache.move_to_end(key)
+                self.image_label.setPixmap(self._scaled_cache[key])
+                return
+
             scaled_width = int(self.original_pixmap.width() * self.zoom_factor)
             scaled_height = int(self.original_pixmap.height() * self.zoom_factor)
 
-            scaled_pixmap = self.original_pixmap.scaled(
+            source = self.original_pixmap
+            if self._preview and scaled_width <= self._preview.width():
+                source = self._preview
+
+            scaled_pixmap = source.scaled(
                 scaled_width,
                 scaled_height,
                 Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
+                (
+                    Qt.TransformationMode.SmoothTransformation
+                    if smooth
+                    else Qt.TransformationMode.FastTransformation
+                ),
             )
 
             self.image_label.setPixmap(scaled_pixmap)
 
+            if smooth:
+                self._cache_scaled(key, scaled_pixmap)
+            else:
+                self._zoom_timer.start()
+
+    def _cache_scaled(self, key, pixmap):
+        """
+        Add a scaled pixmap to the cache, evicting the least recently used
+        until the cache fits its byte budget.
+
+        Args:
+            key: Rounded zoom factor
+            pixmap: The smoothly scaled pixmap
+        """
+        size = _pixmap_bytes(pixmap)
+        if size > self.SCALED_CACHE_BYTES:
+            return
+
+        self._scaled_cache[key] = pixmap
+        self._scaled_cache_bytes += size
+        while self._scaled_cache_bytes > self.SCALED_CACHE_BYTES:
+            _key, evicted = self._scaled_cache.popitem(last=False)
+            self._scaled_cache_bytes -= _pixmap_bytes(evicted)
+
     def zoom_in(self):
         """
         Increase zoom factor by 20%.
         """
         self.zoom_factor *= 1.2
-        self.update_image()
+        self.update_image(smooth=False)
 
     def zoom_out(self):
         """
         Decrease zoom factor by 20%.
         """
         self.zoom_factor /= 1.2
-        self.update_image()
+        self.update_image(smooth=False)
 
     def reset_zoom(self):
         """
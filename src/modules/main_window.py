@@ -4,25 +4,51 @@ The MainWindow class is responsible for setting up the main window of the applic
 including its title, size, and layout.
 """
 
+import importlib
+
 from PyQt6.QtWidgets import (
     QMainWindow,
     QLabel,
-    QVBoxLayout,
     QWidget,
     QMenuBar,
     QMenu,
-    QApplication,
     QStackedWidget,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QEvent
 
-from modules.notepad import Notepad
-from modules.image_viewer import ImageViewer
-from modules.pdf_viewer import PDFViewer
-from modules.ai_chat import AIChat
-from modules.document_creator import DocumentCreator
 from modules.settings import SettingsDialog
 
+# Title of the main window
+_TITLE = "PyQt6 Desktop Application"
+
+# Alignment for centered widgets
+_CENTER = Qt.AlignmentFlag.AlignCenter
+
+# Connection type for signals handled in the emitting thread
+_DIRECT = Qt.ConnectionType.DirectConnection
+
+# Application widgets by key, as (menu label, module, class), in menu order.
+# Modules are imported and widgets created the first time an application is
+# opened.
+APPLICATIONS = {
+    "notepad": ("メモ帳", "modules.notepad", "Notepad"),
+    "image_viewer": ("イメージビューア", "modules.image_viewer", "ImageViewer"),
+    "pdf_viewer": ("PDFビューア", "modules.pdf_viewer", "PDFViewer"),
+    "ai_chat": ("AIチャット", "modules.ai_chat", "AIChat"),
+    "document_creator": ("書類作成", "modules.document_creator", "DocumentCreator"),
+}
+
+
+def _build_welcome() -> QWidget:
+    """
+    Build the welcome screen.
+    A single label centered on both axes replaces a container widget with a
+    layout and stretches.
+    """
+    welcome_label = QLabel("Welcome to the PyQt6 Desktop Application!")
+    welcome_label.setAlignment(_CENTER)
+    return welcome_label
+
 
 class MainWindow(QMainWindow):
     """
@@ -34,12 +60,13 @@ class MainWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("PyQt6 Desktop Application")
+        self.setWindowTitle(_TITLE)
         self.setGeometry(100, 100, 800, 600)
 
         # Create stacked widget to hold all our applications
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
+        self.stacked_widget.currentChanged.connect(self.update_title)
 
         # Initialize applications
         self.init_welcome_screen()
@@ -48,6 +75,9 @@ class MainWindow(QMainWindow):
         # Show welcome screen by default
         self.stacked_widget.setCurrentIndex(0)
 
+        # Settings dialog, created when first opened and reused afterwards
+        self._settings_dialog = None
+
         # Create menu bar
         self.create_menu_bar()
 
@@ -55,34 +85,53 @@ class MainWindow(QMainWindow):
         """
         Initialize the welcome screen.
         """
-        welcome_widget = QWidget()
-        layout = QVBoxLayout()
+        self.stacked_widget.addWidget(_build_welcome())
 
-        layout.addStretch()
-        self.welcome_label = QLabel("Welcome to the PyQt6 Desktop Application!")
-        layout.addWidget(self.welcome_label, alignment=Qt.AlignmentFlag.AlignCenter)
-        layout.addStretch()
+    def init_applications(self):
+        """
+        Initialize application widget storage.
+        Widgets are created on first use so they do not delay startup.
+        """
+        self._instances = {}
 
-        welcome_widget.setLayout(layout)
-        self.stacked_widget.addWidget(welcome_widget)
+    def _open(self, key):
+        """
+        Show the application with the given key, creating it if needed.
 
-    def init_applications(self):
+        Args:
+            key: Key of the application in APPLICATIONS
         """
-        Initialize all application widgets.
+        widget = self._instances.get(key)
+        if widget is None:
+            _label, module_name, class_name = APPLICATIONS[key]
+            widget_class = getattr(importlib.import_module(module_name), class_name)
+            widget = widget_class(self)
+            widget.installEventFilter(self)
+            self._instances[key] = widget
+            self.stacked_widget.addWidget(widget)
+        self.stacked_widget.setCurrentWidget(widget)
+
+    def update_title(self):
+        """
+        Show the current application's title and unsaved changes marker in
+        the window title.
         """
-        # Create all application instances
-        self.notepad = Notepad(self)
-        self.image_viewer = ImageViewer(self)
-        self.pdf_viewer = PDFViewer(self)
-        self.ai_chat = AIChat(self)
-        self.document_creator = DocumentCreator(self)
+        widget = self.stacked_widget.currentWidget()
+        title = widget.windowTitle()
+        self.setWindowTitle(f"{title} - {_TITLE}" if title else _TITLE)
+        self.setWindowModified(widget.isWindowModified())
 
-        # Add them to the stacked widget
-        self.stacked_widget.addWidget(self.notepad)
-        self.stacked_widget.addWidget(self.image_viewer)
-        self.stacked_widget.addWidget(self.pdf_viewer)
-        self.stacked_widget.addWidget(self.ai_chat)
-        self.stacked_widget.addWidget(self.document_creator)
+    def eventFilter(self, watched, event):
+        """
+        Update the window title when the current application's unsaved
+        changes marker changes.
+        """
+        if (
+            event.type() == QEvent.Type.ModifiedChange
+            and watched is self.stacked_widget.currentWidget()
+        ):
+            self.update_title()
+        return super().eventFilter(watched, event)
 
     def create_menu_bar(self):
         """
@@ -95,62 +144,24 @@ class MainWindow(QMainWindow):
         demo_menu = QMenu("Demo", self)
         menu_bar.addMenu(demo_menu)
 
-        # Add actions for each application
-        notepad_action = demo_menu.addAction("メモ帳")
-        notepad_action.triggered.connect(self.open_notepad)
+        # Actions and their handlers all live in the GUI thread, so the
+        # handlers are called directly without a per-emission thread check
 
-        image_viewer_action = demo_menu.addAction("イメージビューア")
-        image_viewer_action.triggered.connect(self.open_image_viewer)
-
-        pdf_viewer_action = demo_menu.addAction("PDFビューア")
-        pdf_viewer_action.triggered.connect(self.open_pdf_viewer)
-
-        ai_chat_action = demo_menu.addAction("AIチャット")
-        ai_chat_action.triggered.connect(self.open_ai_chat)
-
-        document_creator_action = demo_menu.addAction("書類作成")
-        document_creator_action.triggered.connect(self.open_document_creator)
+        # Add an action for each application
+        for key, (label, _module_name, _class_name) in APPLICATIONS.items():
+            action = demo_menu.addAction(label)
+            action.triggered.connect(lambda _checked, key=key: self._open(key), _DIRECT)
 
         # Add Home menu option
         home_action = demo_menu.addAction("ホーム")
-        home_action.triggered.connect(self.show_welcome_screen)
+        home_action.triggered.connect(self.show_welcome_screen, _DIRECT)
 
         # Add separator
         demo_menu.addSeparator()
 
         # Add Settings menu option
         settings_action = demo_menu.addAction("設定")
-        settings_action.triggered.connect(self.open_settings)
-
-    def open_notepad(self):
-        """
-        Opens the notepad application.
-        """
-        self.stacked_widget.setCurrentWidget(self.notepad)
-
-    def open_image_viewer(self):
-        """
-        Opens the image viewer application.
-        """
-        self.stacked_widget.setCurrentWidget(self.image_viewer)
-
-    def open_pdf_viewer(self):
-        """
-        Opens the PDF viewer application.
-        """
-        self.stacked_widget.setCurrentWidget(self.pdf_viewer)
-
-    def open_ai_chat(self):
-        """
-        Opens the AI chat application.
-        """
-        self.stacked_widget.setCurrentWidget(self.ai_chat)
-
-    def open_document_creator(self):
-        """
-        Opens the document creator application.
-        """
-        self.stacked_widget.setCurrentWidget(self.document_creator)
+        settings_action.triggered.connect(self.open_settings, _DIRECT)
 
     def show_welcome_screen(self):
         """
@@ -162,5 +173,8 @@ class MainWindow(QMainWindow):
         """
         Opens the settings dialog.
         """
-        dialog = SettingsDialog(self)
-        dialog.exec()
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(self)
+        else:
+            self._settings_dialog.load_current_settings()
+        self._settings_dialog.exec()
@@ -3,6 +3,8 @@ Notepad module for the PyQt6 desktop application.
 Provides functionality for creating, editing, and saving text files.
 """
 
+import codecs
+
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -12,7 +14,8 @@ from PyQt6.QtWidgets import (
     QFileDialog,
     QMessageBox,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QFile, QSaveFile, QIODevice
+from PyQt6.QtGui import QTextCursor, QTextDocument, QTextDocumentWriter
 
 
 class Notepad(QWidget):
@@ -21,6 +24,9 @@ class Notepad(QWidget):
     Provides a simple interface for creating, editing, and saving text files.
     """
 
+    # Size of the pieces a file is read and decoded in, in bytes
+    READ_CHUNK_SIZE = 64 * 1024
+
     def __init__(self, parent=None):
         """
         Initialize the Notepad widget.
@@ -38,8 +44,9 @@ class Notepad(QWidget):
         """
         layout = QVBoxLayout()
 
-        # Text editing area
+        # Plain text editing area; pasted rich text is inserted as plain text
         self.text_edit = QTextEdit()
+        self.text_edit.setAcceptRichText(False)
         layout.addWidget(self.text_edit)
 
         # Button layout
@@ -68,32 +75,118 @@ class Notepad(QWidget):
         layout.addLayout(button_layout)
         self.setLayout(layout)
 
+        # The main window shows this title, marked while there are unsaved changes
+        self.setWindowTitle("メモ帳[*]")
+
+        # The notepad owns its documents so they can be replaced on open
+        self.document = None
+        self.set_document(self.create_document())
+
     def new_file(self):
         """
         Create a new file, clearing the current content.
         """
-        if self.maybe_save():
-            self.text_edit.clear()
-            self.current_file = None
+        self.maybe_save(self.clear_file)
+
+    def clear_file(self):
+        """
+        Clear the content and forget the current file.
+        """
+        self.text_edit.clear()
+        self.current_file = None
+        self.reset_modified()
 
     def open_file(self):
         """
         Open a text file and load its content.
         """
-        if self.maybe_save():
-            file_path, _ = QFileDialog.getOpenFileName(
-                self, "テキストファイルを開く", "", "Text Files (*.txt);;All Files (*)"
-            )
-
-            if file_path:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as file:
-                        self.text_edit.setText(file.read())
-                    self.current_file = file_path
-                except Exception as e:
-                    QMessageBox.warning(
-                        self, "エラー", f"ファイルを開けませんでした: {e}"
-                    )
+        self.maybe_save(self.choose_file_to_open)
+
+    def choose_file_to_open(self):
+        """
+        Ask for a text file and load its content.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "テキストファイルを開く", "", "Text Files (*.txt);;All Files (*)"
+        )
+
+        if file_path:
+            try:
+                self.set_document(self.load_document(file_path))
+                self.current_file = file_path
+                self.reset_modified()
+            except Exception as e:
+                QMessageBox.warning(self, "エラー", f"ファイルを開けませんでした: {e}")
+
+    def reset_modified(self):
+        """
+        Mark the content as having no unsaved changes.
+        Replacing the text clears the modified flag without reliably emitting
+        modificationChanged, so the window is marked unmodified here as well.
+        """
+        self.document.setModified(False)
+        self.setWindowModified(False)
+
+    def create_document(self):
+        """
+        Create an empty document for the text editing area.
+
+        Returns:
+            QTextDocument: The document, owned by the text edit
+        """
+        document = QTextDocument(self.text_edit)
+        document.setDefaultFont(self.text_edit.font())
+        return document
+
+    def set_document(self, document):
+        """
+        Show a document in the text editing area, replacing the current one.
+
+        Args:
+            document: Document created by create_document
+        """
+        old_document = self.document
+        self.text_edit.setDocument(document)
+        self.document = document
+        document.modificationChanged.connect(self.setWindowModified)
+        if old_document is not None:
+            old_document.deleteLater()
+
+    def load_document(self, file_path):
+        """
+        Load a UTF-8 text file into a new document.
+        The file is read and decoded piece by piece into a document that is
+        not shown yet, so neither the whole file nor the editor's relayout
+        is paid for at once.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            QTextDocument: A document holding the file content
+        """
+        # Text mode normalizes line endings, as Python's text files do
+        file = QFile(file_path)
+        if not file.open(QIODevice.OpenModeFlag.ReadOnly | QIODevice.OpenModeFlag.Text):
+            raise OSError(file.errorString())
+
+        document = self.create_document()
+        try:
+            # Loading is not an undoable edit
+            document.setUndoRedoEnabled(False)
+            cursor = QTextCursor(document)
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            while not file.atEnd():
+                chunk = file.read(self.READ_CHUNK_SIZE)
+                cursor.insertText(decoder.decode(bytes(chunk)))
+            cursor.insertText(decoder.decode(b"", final=True))
+            document.setUndoRedoEnabled(True)
+        except Exception:
+            document.deleteLater()
+            raise
+        finally:
+            file.close()
+        return document
 
     def save_file(self):
         """
@@ -127,36 +220,63 @@ class Notepad(QWidget):
             bool: True if save was successful, False otherwise
         """
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write(self.text_edit.toPlainText())
+            # The file is replaced only once everything has been written, so a
+            # failed save leaves the previous version intact
+            file = QSaveFile(file_path)
+            if not file.open(
+                QIODevice.OpenModeFlag.WriteOnly | QIODevice.OpenModeFlag.Text
+            ):
+                raise OSError(file.errorString())
+
+            # Encode the document as UTF-8 within Qt, without building a
+            # Python string of the whole text first. The writer closes its
+            # device, which QSaveFile does not allow, so it writes to a buffer.
+            buffer = QBuffer()
+            writer = QTextDocumentWriter(buffer, QByteArray(b"plaintext"))
+            if not writer.write(self.document):
+                raise OSError(buffer.errorString())
+            file.write(buffer.data())
+            if not file.commit():
+                raise OSError(file.errorString())
             self.current_file = file_path
+            self.reset_modified()
             return True
         except Exception as e:
             QMessageBox.warning(self, "エラー", f"ファイルを保存できませんでした: {e}")
             return False
 
-    def maybe_save(self):
+    def maybe_save(self, proceed):
         """
         Check if there are unsaved changes and prompt the user to save them.
+        The prompt is window-modal but does not block the event loop; the
+        operation continues once the user has answered.
 
-        Returns:
-            bool: True if okay to proceed, False to cancel the operation
+        Args:
+            proceed: Called if it is okay to proceed, i.e. unless the user
+                cancels the prompt or saving fails
         """
-        if not self.text_edit.document().isModified():
-            return True
+        if not self.document.isModified():
+            proceed()
+            return
 
-        response = QMessageBox.question(
-            self,
+        box = QMessageBox(
+            QMessageBox.Icon.Question,
             "未保存の変更",
             "ドキュメントに未保存の変更があります。保存しますか？",
             QMessageBox.StandardButton.Save
             | QMessageBox.StandardButton.Discard
             | QMessageBox.StandardButton.Cancel,
+            self,
         )
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
 
-        if response == QMessageBox.StandardButton.Save:
-            return self.save_file()
-        elif response == QMessageBox.StandardButton.Cancel:
-            return False
+        def on_finished(_result):
+            response = box.standardButton(box.clickedButton())
+            if response == QMessageBox.StandardButton.Save:
+                if self.save_file():
+                    proceed()
+            elif response == QMessageBox.StandardButton.Discard:
+                proceed()
 
-        return True
+        box.finished.connect(on_finished)
+        box.open()
@@ -8,14 +8,17 @@ reference: https://github.com/BBC-Esq/PyQt6-PDF-Viewer
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
+    QLabel,
     QPushButton,
     QHBoxLayout,
     QFileDialog,
     QMessageBox,
 )
 from PyQt6.QtCore import Qt, QUrl
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEnginePage
+
+
+# Alignment for centered widgets
+_CENTER = Qt.AlignmentFlag.AlignCenter
 
 
 class PDFViewer(QWidget):
@@ -41,30 +44,14 @@ class PDFViewer(QWidget):
         """
         layout = QVBoxLayout()
 
-        # Web view for PDF rendering
-        self.web_view = QWebEngineView()
-        self.web_view.settings().setAttribute(
-            self.web_view.settings().WebAttribute.PluginsEnabled, True
-        )
-        self.web_view.settings().setAttribute(
-            self.web_view.settings().WebAttribute.PdfViewerEnabled, True
-        )
-
-        # Set default content
-        self.web_view.setHtml(
-            """
-            <html>
-            <body style="display: flex; justify-content: center; align-items: center; height: 100vh; font-family: Arial, sans-serif;">
-                <div style="text-align: center;">
-                    <h2>PDFビューア</h2>
-                    <p>「PDFを開く」ボタンをクリックしてPDFファイルを表示します</p>
-                </div>
-            </body>
-            </html>
-            """
+        # The web view starts a Chromium renderer process, so it is created
+        # when the first PDF is opened. Until then a label shows usage hints.
+        self.web_view = None
+        self.placeholder = QLabel(
+            "PDFビューア\n\n「PDFを開く」ボタンをクリックしてPDFファイルを表示します"
         )
-
-        layout.addWidget(self.web_view)
+        self.placeholder.setAlignment(_CENTER)
+        layout.addWidget(self.placeholder)
 
         # Button layout
         button_layout = QHBoxLayout()
@@ -87,12 +74,46 @@ class PDFViewer(QWidget):
 
         if file_path:
             try:
+                self.load_pdf(file_path)
                 self.current_pdf_path = file_path
-                # Convert file path to URL with page-width zoom setting
-                pdf_url = QUrl.fromLocalFile(file_path)
-                pdf_url.setFragment(
-                    "zoom=page-width"
-                )  # This sets initial zoom to fit page width
-                self.web_view.setUrl(pdf_url)
             except Exception as e:
                 QMessageBox.warning(self, "エラー", f"PDFを開けませんでした: {e}")
+
+    def load_pdf(self, file_path):
+        """
+        Load the PDF from the specified file path into the web view.
+
+        Args:
+            file_path: Path to the PDF file
+        """
+        if self.web_view is None:
+            self.web_view = self.create_web_view()
+            self.layout().replaceWidget(self.placeholder, self.web_view)
+            self.placeholder.deleteLater()
+            self.placeholder = None
+
+        # Convert file path to URL with page-width zoom setting
+        pdf_url = QUrl.fromLocalFile(file_path)
+        pdf_url.setFragment(
+            "zoom=page-width"
+        )  # This sets initial zoom to fit page width
+        self.web_view.setUrl(pdf_url)
+
+    def create_web_view(self):
+        """
+        Create the web view used for PDF rendering.
+
+        Returns:
+            QWebEngineView: A web view with the built-in PDF viewer enabled
+        """
+        # QtWebEngine is loaded with the first PDF rather than with the viewer
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+
+        web_view = QWebEngineView()
+        web_view.settings().setAttribute(
+            web_view.settings().WebAttribute.PluginsEnabled, True
+        )
+        web_view.settings().setAttribute(
+            web_view.settings().WebAttribute.PdfViewerEnabled, True
+        )
+        return web_view
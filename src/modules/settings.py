@@ -4,25 +4,21 @@ Provides a user interface for configuring application settings.
 """
 
 import os
-from pathlib import Path
 
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
-    QHBoxLayout,
     QFormLayout,
     QLabel,
     QLineEdit,
-    QComboBox,
-    QPushButton,
     QDialogButtonBox,
     QMessageBox,
     QTabWidget,
     QWidget,
 )
-from PyQt6.QtCore import QSize
+from PyQt6.QtCore import QSize, QSaveFile, QIODevice
 
-from modules.config import config
+from modules.config import config, config_signals
 
 
 class SettingsDialog(QDialog):
@@ -61,11 +57,13 @@ class SettingsDialog(QDialog):
         # OpenAI API Key field
         self.api_key_field = QLineEdit()
         self.api_key_field.setEchoMode(QLineEdit.EchoMode.Password)
+        self.api_key_field.setPlaceholderText("sk-...")
         self.api_key_field.setMinimumWidth(300)  # Set minimum width for API key field
         form_layout.addRow("OpenAI APIキー:", self.api_key_field)
 
         # AI Model text input
         self.model_input = QLineEdit()
+        self.model_input.setPlaceholderText("gpt-4o")
         self.model_input.setMinimumWidth(300)  # Set minimum width for model input field
         form_layout.addRow("AIモデル:", self.model_input)
 
@@ -90,12 +88,16 @@ class SettingsDialog(QDialog):
 
     def load_current_settings(self):
         """Load current settings from config into UI fields"""
-        # Load API Key if available
-        if config.OPEN_AI_API_KEY:
-            self.api_key_field.setText(config.OPEN_AI_API_KEY)
+        # Load API Key if available; fields are reloaded each time the dialog
+        # is shown, so edits from a cancelled session are discarded. Unchanged
+        # fields are left alone to avoid needless textChanged emissions.
+        api_key = config.OPEN_AI_API_KEY or ""
+        if self.api_key_field.text() != api_key:
+            self.api_key_field.setText(api_key)
 
         # Set current model in text input
-        self.model_input.setText(config.AI_MODEL_NAME)
+        if self.model_input.text() != config.AI_MODEL_NAME:
+            self.model_input.setText(config.AI_MODEL_NAME)
 
     def save_settings(self):
         """Save settings from UI to config"""
@@ -117,6 +119,9 @@ class SettingsDialog(QDialog):
             # Write settings to .env file
             self.write_env_file()
 
+            # Notify consumers such as the AI agents
+            config_signals.config_changed.emit()
+
             QMessageBox.information(self, "成功", "設定を保存しました！")
             self.accept()
         except Exception as e:
@@ -127,25 +132,30 @@ class SettingsDialog(QDialog):
         env_path = config.APP_DIR / ".env"
 
         # Read existing content if file exists
-        existing_lines = []
-        if env_path.exists():
-            with open(env_path, "r", encoding="utf-8") as f:
-                existing_lines = f.readlines()
+        old_content = env_path.read_bytes() if env_path.exists() else b""
 
-        # Filter out the keys we're going to update
-        filtered_lines = [
+        # Keep other lines, dropping the keys we're going to update
+        lines = [
             line
-            for line in existing_lines
-            if not (
-                line.startswith("OPEN_AI_API_KEY=") or line.startswith("AI_MODEL_NAME=")
-            )
+            for line in old_content.splitlines()
+            if not line.startswith((b"OPEN_AI_API_KEY=", b"AI_MODEL_NAME="))
         ]
 
         # Add our settings
         if config.OPEN_AI_API_KEY:
-            filtered_lines.append(f"OPEN_AI_API_KEY={config.OPEN_AI_API_KEY}\n")
-        filtered_lines.append(f"AI_MODEL_NAME={config.AI_MODEL_NAME}\n")
-
-        # Write back to file
-        with open(env_path, "w", encoding="utf-8") as f:
-            f.writelines(filtered_lines)
+            lines.append(f"OPEN_AI_API_KEY={config.OPEN_AI_API_KEY}".encode("utf-8"))
+        lines.append(f"AI_MODEL_NAME={config.AI_MODEL_NAME}".encode("utf-8"))
+        new_content = b"\n".join(lines) + b"\n"
+
+        # Leave the file untouched if nothing changed
+        if new_content == old_content:
+            return
+
+        # Replace the file only once everything is written, so a failed write
+        # cannot leave the settings half-written
+        env_file = QSaveFile(str(env_path))
+        if not env_file.open(QIODevice.OpenModeFlag.WriteOnly):
+            raise OSError(env_file.errorString())
+        env_file.write(new_content)
+        if not env_file.commit():
+            raise OSError(env_file.errorString())